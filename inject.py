@@ -11,8 +11,7 @@ Usage:
 
 Requirements:
     - Windows OS
-    - Python 3.6+
-    - psutil  (pip install psutil)
+    - Python 3.6+ (stdlib only, no third-party packages)
     - Run as Administrator
 """
 
@@ -20,9 +19,12 @@ import ctypes
 import struct
 import sys
 import os
-import psutil
 from ctypes import wintypes
 
+# Everything below talks to win32 APIs directly; fail fast elsewhere
+if sys.platform != 'win32':
+    sys.exit("[ERROR] inject.py only runs on Windows")
+
 # ============================================================
 # Windows API Constants
 # ============================================================
@@ -31,10 +33,17 @@ PROCESS_ALL_ACCESS = 0x1F0FFF       # Full access rights to a process
 MEM_COMMIT         = 0x00001000     # Commit memory pages
 MEM_RESERVE        = 0x00002000     # Reserve memory pages
 PAGE_READWRITE     = 0x04           # Read/write page protection
+PAGE_EXECUTE_READ  = 0x20           # Execute/read page protection
+TH32CS_SNAPPROCESS = 0x00000002     # Snapshot: all processes
 TH32CS_SNAPMODULE  = 0x00000008     # Snapshot: modules of a process
 TH32CS_SNAPMODULE32= 0x00000010     # Snapshot: 32-bit modules (for WoW64)
+LIST_MODULES_32BIT = 0x00000001     # EnumProcessModulesEx: 32-bit modules only
+SystemProcessInformation      = 5            # NtQuerySystemInformation class
+STATUS_INFO_LENGTH_MISMATCH   = 0xC0000004   # NTSTATUS: buffer too small
 INFINITE           = 0xFFFFFFFF     # Infinite wait timeout
 WAIT_OBJECT_0      = 0x00000000     # Wait completed successfully
+WAIT_TIMEOUT       = 0x00000102     # Wait timed out
+STILL_ACTIVE       = 259            # GetExitCodeThread: thread still running
 
 # ============================================================
 # Kernel32 DLL - Load & Define Function Signatures
@@ -47,6 +56,16 @@ kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
 kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
 kernel32.OpenProcess.restype = wintypes.HANDLE
 
+# VirtualAlloc/VirtualProtect - allocate and reprotect memory in this process
+kernel32.VirtualAlloc.argtypes = [
+    wintypes.LPVOID, ctypes.c_size_t, wintypes.DWORD, wintypes.DWORD
+]
+kernel32.VirtualAlloc.restype = wintypes.LPVOID
+kernel32.VirtualProtect.argtypes = [
+    wintypes.LPVOID, ctypes.c_size_t, wintypes.DWORD, wintypes.PDWORD
+]
+kernel32.VirtualProtect.restype = wintypes.BOOL
+
 # VirtualAllocEx - allocates memory in a remote process
 kernel32.VirtualAllocEx.argtypes = [
     wintypes.HANDLE, wintypes.LPVOID, ctypes.c_size_t,
@@ -91,10 +110,46 @@ kernel32.CloseHandle.restype = wintypes.BOOL
 kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
 kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
 
+# GetModuleHandleW - gets the handle (base address) of a loaded module.
+# Without an explicit HMODULE restype, ctypes would default to c_int and
+# truncate the pointer on 64-bit Python
+kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+# GetProcAddress - gets the address of an exported function
+kernel32.GetProcAddress.argtypes = [wintypes.HMODULE, ctypes.c_char_p]
+kernel32.GetProcAddress.restype = ctypes.c_void_p
+
 # IsWow64Process - checks if a process runs under WoW64 (32-bit on 64-bit OS)
 kernel32.IsWow64Process.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.BOOL)]
 kernel32.IsWow64Process.restype = wintypes.BOOL
 
+# ============================================================
+# PROCESSENTRY32W - Structure for process snapshot enumeration
+# ============================================================
+
+class PROCESSENTRY32W(ctypes.Structure):
+    """Describes a process in a system snapshot.
+    Used with Process32FirstW/Process32NextW to iterate running processes."""
+    _fields_ = [
+        ('dwSize',              wintypes.DWORD),      # Size of this struct (must be set before use)
+        ('cntUsage',            wintypes.DWORD),      # Unused (always 0)
+        ('th32ProcessID',       wintypes.DWORD),      # Process ID
+        ('th32DefaultHeapID',   ctypes.POINTER(ctypes.c_ulong)),  # Unused (always 0)
+        ('th32ModuleID',        wintypes.DWORD),      # Unused (always 0)
+        ('cntThreads',          wintypes.DWORD),      # Number of threads
+        ('th32ParentProcessID', wintypes.DWORD),      # Parent process ID
+        ('pcPriClassBase',      wintypes.LONG),       # Base thread priority
+        ('dwFlags',             wintypes.DWORD),      # Unused (always 0)
+        ('szExeFile',           ctypes.c_wchar * 260),# Executable name (e.g. "hl.exe")
+    ]
+
+# Process32FirstW/NextW - iterate through a process snapshot
+kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+kernel32.Process32FirstW.restype = wintypes.BOOL
+kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+kernel32.Process32NextW.restype = wintypes.BOOL
+
 # ============================================================
 # MODULEENTRY32 - Structure for module snapshot enumeration
 # ============================================================
@@ -121,20 +176,270 @@ kernel32.Module32First.restype = wintypes.BOOL
 kernel32.Module32Next.argtypes = [wintypes.HANDLE, ctypes.POINTER(MODULEENTRY32)]
 kernel32.Module32Next.restype = wintypes.BOOL
 
+# ============================================================
+# Psapi DLL - Module enumeration without a Toolhelp snapshot
+# ============================================================
+
+psapi = ctypes.WinDLL('psapi', use_last_error=True)
+
+class MODULEINFO(ctypes.Structure):
+    """Module base/size/entry info returned by GetModuleInformation."""
+    _fields_ = [
+        ('lpBaseOfDll', ctypes.c_void_p),   # Base address of the module
+        ('SizeOfImage', wintypes.DWORD),    # Size of the module in bytes
+        ('EntryPoint',  ctypes.c_void_p),   # Module entry point
+    ]
+
+# EnumProcessModulesEx - lists module handles of a process (reads the PEB
+# directly, unlike Toolhelp which suspends target threads for a snapshot)
+psapi.EnumProcessModulesEx.argtypes = [
+    wintypes.HANDLE, ctypes.POINTER(wintypes.HMODULE),
+    wintypes.DWORD, wintypes.LPDWORD, wintypes.DWORD
+]
+psapi.EnumProcessModulesEx.restype = wintypes.BOOL
+
+# GetModuleBaseNameA - gets a module's file name (e.g. "kernel32.dll")
+psapi.GetModuleBaseNameA.argtypes = [
+    wintypes.HANDLE, wintypes.HMODULE, wintypes.LPSTR, wintypes.DWORD
+]
+psapi.GetModuleBaseNameA.restype = wintypes.DWORD
+
+# GetModuleFileNameExA - gets a module's full on-disk path
+psapi.GetModuleFileNameExA.argtypes = [
+    wintypes.HANDLE, wintypes.HMODULE, wintypes.LPSTR, wintypes.DWORD
+]
+psapi.GetModuleFileNameExA.restype = wintypes.DWORD
+
+# GetModuleInformation - gets a module's base address and size
+psapi.GetModuleInformation.argtypes = [
+    wintypes.HANDLE, wintypes.HMODULE, ctypes.POINTER(MODULEINFO), wintypes.DWORD
+]
+psapi.GetModuleInformation.restype = wintypes.BOOL
+
+# ============================================================
+# Ntdll DLL - Process enumeration in a single syscall
+# ============================================================
+
+ntdll = ctypes.WinDLL('ntdll')
+
+# NtQuerySystemInformation - fills one contiguous buffer with records for
+# every process in a single syscall (the same API Task Manager uses)
+ntdll.NtQuerySystemInformation.argtypes = [
+    wintypes.ULONG, wintypes.LPVOID, wintypes.ULONG, wintypes.PULONG
+]
+ntdll.NtQuerySystemInformation.restype = wintypes.ULONG  # NTSTATUS
+
+class UNICODE_STRING(ctypes.Structure):
+    """Counted UTF-16 string used throughout the native API."""
+    _fields_ = [
+        ('Length',        wintypes.USHORT),   # Length in bytes (no terminator)
+        ('MaximumLength', wintypes.USHORT),   # Buffer capacity in bytes
+        ('Buffer',        ctypes.c_void_p),   # Pointer to the characters
+    ]
+
+class SYSTEM_PROCESS_INFORMATION(ctypes.Structure):
+    """Leading fields of one process record returned by
+    NtQuerySystemInformation(SystemProcessInformation). Records are
+    chained by NextEntryOffset; only the fields up to the PID are
+    declared since nothing past them is read."""
+    _fields_ = [
+        ('NextEntryOffset',              wintypes.ULONG),     # Byte offset to next record (0 = last)
+        ('NumberOfThreads',              wintypes.ULONG),     # Thread count
+        ('WorkingSetPrivateSize',        ctypes.c_longlong),  # Private working set
+        ('HardFaultCount',               wintypes.ULONG),     # Hard page faults
+        ('NumberOfThreadsHighWatermark', wintypes.ULONG),     # Peak thread count
+        ('CycleTime',                    ctypes.c_ulonglong), # CPU cycles consumed
+        ('CreateTime',                   ctypes.c_longlong),  # Process creation time
+        ('UserTime',                     ctypes.c_longlong),  # Time spent in user mode
+        ('KernelTime',                   ctypes.c_longlong),  # Time spent in kernel mode
+        ('ImageName',                    UNICODE_STRING),     # Executable name (e.g. "hl.exe")
+        ('BasePriority',                 wintypes.LONG),      # Scheduling priority
+        ('UniqueProcessId',              ctypes.c_void_p),    # PID
+        ('InheritedFromUniqueProcessId', ctypes.c_void_p),    # Parent PID
+    ]
+
+# ============================================================
+# Import-Time Constants
+# ============================================================
+
+# This process's own kernel32 base and LoadLibraryA address are fixed for
+# the lifetime of the interpreter, so resolve them once here instead of
+# on every same-arch injection
+_LOCAL_KERNEL32 = kernel32.GetModuleHandleW("kernel32.dll")
+_LOCAL_LOADLIB  = kernel32.GetProcAddress(_LOCAL_KERNEL32, b"LoadLibraryA")
+
 # ============================================================
 # Helper Functions
 # ============================================================
 
+# Direct-syscall stub for NtReadVirtualMemory. A ReadProcessMemory call
+# traverses kernel32 -> kernelbase -> ntdll before reaching the kernel,
+# which is especially costly when a 64-bit injector reads a WoW64
+# target. On a 64-bit interpreter the syscall ordinal can be lifted from
+# ntdll's own prologue and invoked from a tiny local stub, trimming that
+# userland detour from every remote read.
+_NT_READ_PROTO = ctypes.WINFUNCTYPE(
+    wintypes.ULONG,                    # NTSTATUS
+    wintypes.HANDLE,                   # ProcessHandle
+    wintypes.LPCVOID,                  # BaseAddress
+    wintypes.LPVOID,                   # Buffer
+    ctypes.c_size_t,                   # NumberOfBytesToRead
+    ctypes.POINTER(ctypes.c_size_t),   # NumberOfBytesRead
+)
+_nt_read_stub = None
+_nt_read_probed = False
+
+
+def _get_nt_read_stub():
+    """Build (once) a local NtReadVirtualMemory syscall stub.
+
+    Reads the prologue of ntdll!NtReadVirtualMemory in this process,
+    extracts the syscall ordinal and assembles
+    'mov r10,rcx; mov eax,<ord>; syscall; ret' into an executable page.
+    Returns the callable stub, or None when the prologue doesn't match
+    the expected pattern (32-bit interpreter, hooked or unexpected ntdll
+    build) - callers then fall back to ReadProcessMemory."""
+    global _nt_read_stub, _nt_read_probed
+    if _nt_read_probed:
+        return _nt_read_stub
+    _nt_read_probed = True
+
+    if not is_self_64bit():
+        return None
+
+    prologue = ctypes.string_at(
+        ctypes.cast(ntdll.NtReadVirtualMemory, ctypes.c_void_p).value, 8
+    )
+    # Expected x64 prologue: 4C 8B D1 (mov r10,rcx) B8 <ordinal:4> (mov eax,imm32)
+    if prologue[:4] != b'\x4c\x8b\xd1\xb8':
+        return None
+    stub = prologue + b'\x0f\x05\xc3'  # + syscall; ret
+
+    page = kernel32.VirtualAlloc(
+        None, len(stub), MEM_COMMIT | MEM_RESERVE, PAGE_READWRITE
+    )
+    if not page:
+        return None
+    ctypes.memmove(page, stub, len(stub))
+    old_protect = wintypes.DWORD(0)
+    if not kernel32.VirtualProtect(
+        page, len(stub), PAGE_EXECUTE_READ, ctypes.byref(old_protect)
+    ):
+        return None
+
+    _nt_read_stub = _NT_READ_PROTO(page)
+    return _nt_read_stub
+
+
+# Reusable scratch buffer for remote reads. Fabricating a fresh
+# (ctypes.c_byte * N)() array per ReadProcessMemory call and then copying
+# it with bytes() doubles the memory traffic; one growable bytearray is
+# reused across reads and parsed in place with struct.unpack_from.
+_scratch = bytearray(0x10000)
+
+
+def _read_remote(h_process, address, size):
+    """Read `size` bytes of remote memory into the shared scratch buffer.
+
+    Returns the scratch bytearray on success (valid for the first `size`
+    bytes, and only until the next call), or None on failure."""
+    global _scratch
+    if size > len(_scratch):
+        _scratch = bytearray(size)
+    view = (ctypes.c_char * size).from_buffer(_scratch)
+    bytes_read = ctypes.c_size_t(0)
+    nt_read = _get_nt_read_stub()
+    if nt_read is not None:
+        # NTSTATUS: zero is success
+        ok = nt_read(h_process, address, view, size, ctypes.byref(bytes_read)) == 0
+    else:
+        ok = kernel32.ReadProcessMemory(
+            h_process, address, view, size, ctypes.byref(bytes_read)
+        )
+    del view  # drop the buffer export so _scratch can grow next time
+    if not ok:
+        return None
+    return _scratch
+
+
+# Cache of resolved LoadLibraryA RVAs, keyed on the target's kernel32
+# identity (arch, module size, on-disk path). The base address may vary
+# across processes due to ASLR, so the RVA is cached rather than the VA;
+# a cache hit skips the entire remote PE export-table parse.
+_loadlib_cache = {}
+
 def find_process_by_name(process_name):
     """Search all running processes and return the PID matching the given name.
+
+    Primary path is NtQuerySystemInformation(SystemProcessInformation),
+    which returns every process record in one contiguous buffer from a
+    single syscall. A Toolhelp snapshot still enumerates all processes
+    internally and can take noticeably longer on loaded systems, so it
+    is kept only as a fallback.
+
     Returns None if the process is not found."""
-    for proc in psutil.process_iter(['pid', 'name']):
-        try:
-            if proc.info['name'].lower() == process_name.lower():
-                return proc.info['pid']
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
-    return None
+    pid = _find_process_nt(process_name)
+    if pid is None:
+        pid = _find_process_toolhelp(process_name)
+    return pid
+
+
+def _find_process_nt(process_name):
+    """Process lookup via NtQuerySystemInformation(SystemProcessInformation)."""
+    # Retry with a growing buffer until the snapshot fits (the process
+    # list can change between the size probe and the real call)
+    size = 0x40000
+    while True:
+        buf = ctypes.create_string_buffer(size)
+        needed = wintypes.ULONG(0)
+        status = ntdll.NtQuerySystemInformation(
+            SystemProcessInformation, buf, size, ctypes.byref(needed)
+        )
+        if status == STATUS_INFO_LENGTH_MISMATCH:
+            size = max(size * 2, needed.value + 0x10000)
+            continue
+        if status != 0:
+            return None
+        break
+
+    target_name = process_name.lower()
+    offset = 0
+
+    # Records are chained by NextEntryOffset; 0 marks the last one
+    while True:
+        info = SYSTEM_PROCESS_INFORMATION.from_buffer(buf, offset)
+        if info.ImageName.Buffer and info.ImageName.Length:
+            name = ctypes.wstring_at(info.ImageName.Buffer, info.ImageName.Length // 2)
+            if name.lower() == target_name:
+                return info.UniqueProcessId
+        if info.NextEntryOffset == 0:
+            return None
+        offset += info.NextEntryOffset
+
+
+def _find_process_toolhelp(process_name):
+    """Process lookup via a CreateToolhelp32Snapshot process walk."""
+    snap = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snap == -1 or snap == ctypes.c_void_p(-1).value:
+        return None
+
+    pe32 = PROCESSENTRY32W()
+    pe32.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+
+    target_name = process_name.lower()
+    found_pid = None
+
+    # Walk through the process list, stopping at the first match
+    if kernel32.Process32FirstW(snap, ctypes.byref(pe32)):
+        while True:
+            if pe32.szExeFile.lower() == target_name:
+                found_pid = pe32.th32ProcessID
+                break
+            if not kernel32.Process32NextW(snap, ctypes.byref(pe32)):
+                break
+
+    kernel32.CloseHandle(snap)
+    return found_pid
 
 
 def is_target_32bit(h_process):
@@ -151,20 +456,63 @@ def is_self_64bit():
     return ctypes.sizeof(ctypes.c_void_p) == 8
 
 
-def find_remote_module_base(process_id, module_name):
-    """Find a module's base address in a remote process.
+def find_remote_module(h_process, process_id, module_name):
+    """Find a module loaded in a remote process.
 
-    Uses CreateToolhelp32Snapshot to enumerate all modules loaded
-    in the target process, then returns the base address of the
-    module matching the given name.
+    Enumerates the target's 32-bit modules via EnumProcessModulesEx,
+    which reads the PEB module list directly. CreateToolhelp32Snapshot
+    can stall for 100-250ms on busy systems because it suspends the
+    target's threads to build the snapshot; the psapi path has no such
+    stall. The Toolhelp walk is kept as a fallback in case psapi
+    enumeration fails.
 
     Args:
-        process_id:  PID of the target process
+        h_process:   Handle to the target process
+        process_id:  PID of the target process (for the Toolhelp fallback)
         module_name: Name of the module to find (e.g. "kernel32.dll")
 
     Returns:
-        Base address (int) of the module, or None if not found.
+        Tuple (base_address, size, path_bytes) of the module,
+        or None if not found.
     """
+    found = _find_remote_module_psapi(h_process, module_name)
+    if found is None:
+        found = _find_remote_module_toolhelp(process_id, module_name)
+    return found
+
+
+def _find_remote_module_psapi(h_process, module_name):
+    """Module lookup via EnumProcessModulesEx + GetModuleBaseNameA."""
+    modules = (wintypes.HMODULE * 1024)()
+    needed = wintypes.DWORD(0)
+    if not psapi.EnumProcessModulesEx(
+        h_process, modules, ctypes.sizeof(modules),
+        ctypes.byref(needed), LIST_MODULES_32BIT
+    ):
+        return None
+
+    count = min(needed.value // ctypes.sizeof(wintypes.HMODULE), len(modules))
+    target_name = module_name.lower().encode('ascii')
+    name_buf = ctypes.create_string_buffer(260)
+
+    for i in range(count):
+        if not psapi.GetModuleBaseNameA(h_process, modules[i], name_buf, 260):
+            continue
+        if name_buf.value.lower() == target_name:
+            # An HMODULE is the module's base address on Windows
+            info = MODULEINFO()
+            if not psapi.GetModuleInformation(
+                h_process, modules[i], ctypes.byref(info), ctypes.sizeof(info)
+            ):
+                return None
+            path_buf = ctypes.create_string_buffer(260)
+            psapi.GetModuleFileNameExA(h_process, modules[i], path_buf, 260)
+            return (modules[i], info.SizeOfImage, path_buf.value)
+    return None
+
+
+def _find_remote_module_toolhelp(process_id, module_name):
+    """Module lookup via a CreateToolhelp32Snapshot module walk."""
     # Take a snapshot of all modules in the process
     snap = kernel32.CreateToolhelp32Snapshot(
         TH32CS_SNAPMODULE | TH32CS_SNAPMODULE32, process_id
@@ -176,33 +524,41 @@ def find_remote_module_base(process_id, module_name):
     me32 = MODULEENTRY32()
     me32.dwSize = ctypes.sizeof(MODULEENTRY32)
 
-    found_base = None
+    # szModule is already ASCII bytes, so compare as bytes instead of
+    # decoding and lowercasing a str per entry
+    target_name = module_name.lower().encode('ascii')
+    found = None
 
     # Walk through the module list
     if kernel32.Module32First(snap, ctypes.byref(me32)):
         while True:
-            name = me32.szModule.decode('utf-8', errors='ignore').lower()
-            if name == module_name.lower():
-                found_base = me32.modBaseAddr
+            # Some Windows versions return entries for other processes'
+            # mappings; skip them before touching the name
+            if (me32.th32ProcessID == process_id
+                    and me32.szModule.lower() == target_name):
+                found = (me32.modBaseAddr, me32.modBaseSize, me32.szExePath)
                 break
             if not kernel32.Module32Next(snap, ctypes.byref(me32)):
                 break
 
     kernel32.CloseHandle(snap)
-    return found_base
+    return found
 
 
-def find_remote_export(h_process, module_base, function_name):
-    """Parse the PE export table of a remote module to find a function address.
+def _find_remote_export_pe32(h_process, module_base, function_name):
+    """Parse the PE32 export table of a remote module to find a function address.
 
     This reads the PE headers directly from the target process's memory,
     which allows finding function addresses even when the injector and
-    target have different architectures (64-bit -> 32-bit).
+    target have different architectures (64-bit -> 32-bit). It is only
+    ever called on that cross-arch path, where the target module is
+    guaranteed PE32, so the PE32+ layout is not handled.
 
     How it works:
       1. Read the DOS header to find PE header offset (e_lfanew)
-      2. Read the PE optional header to locate the export directory RVA
-      3. Read the export directory to get name/ordinal/function arrays
+      2. Read the PE optional header to locate the export directory RVA + size
+      3. Read the whole export directory in one go (header, name/ordinal/
+         function arrays and name strings all live inside its extent)
       4. Search the name array for the desired function
       5. Use the ordinal to index into the function address array
 
@@ -215,106 +571,101 @@ def find_remote_export(h_process, module_base, function_name):
         Virtual address (int) of the function, or None if not found.
     """
     func_name_bytes = function_name.encode('ascii')
-    bytes_read = ctypes.c_size_t(0)
 
     # --- Step 1: Read DOS header to get PE header offset ---
-    dos_header = (ctypes.c_byte * 64)()
-    if not kernel32.ReadProcessMemory(
-        h_process, module_base, dos_header, 64, ctypes.byref(bytes_read)
-    ):
+    dos_data = _read_remote(h_process, module_base, 64)
+    if dos_data is None:
         return None
 
     # e_lfanew (at offset 0x3C) points to the PE signature
-    e_lfanew = struct.unpack_from('<I', bytes(dos_header), 0x3C)[0]
+    e_lfanew = struct.unpack_from('<I', dos_data, 0x3C)[0]
 
     # --- Step 2: Read PE header + optional header ---
-    pe_header = (ctypes.c_byte * 256)()
-    if not kernel32.ReadProcessMemory(
-        h_process, module_base + e_lfanew, pe_header, 256, ctypes.byref(bytes_read)
-    ):
+    # 128 bytes covers the 4-byte signature, 20-byte file header and the
+    # PE32 optional header through the export data directory entry
+    # (optional header offsets 96..104)
+    pe_data = _read_remote(h_process, module_base + e_lfanew, 128)
+    if pe_data is None:
         return None
 
-    pe_data = bytes(pe_header)
-
     # Verify PE signature ("PE\0\0" = 0x4550)
     pe_sig = struct.unpack_from('<I', pe_data, 0)[0]
     if pe_sig != 0x4550:
         return None
 
-    # Determine PE format from magic number
-    # Offset 24 = start of optional header (after 4-byte PE sig + 20-byte file header)
+    # Offset 24 = start of optional header (after 4-byte PE sig + 20-byte
+    # file header). The target is always PE32 here; anything else means a
+    # corrupted or unexpected module
     magic = struct.unpack_from('<H', pe_data, 24)[0]
+    if magic != 0x10B:
+        return None
 
-    if magic == 0x10B:     # PE32 (32-bit) - export dir RVA at optional header offset 96
-        export_rva = struct.unpack_from('<I', pe_data, 24 + 96)[0]
-    elif magic == 0x20B:   # PE32+ (64-bit) - export dir RVA at optional header offset 112
-        export_rva = struct.unpack_from('<I', pe_data, 24 + 112)[0]
-    else:
-        return None  # Unknown PE format
+    # PE32 export data directory at optional header offset 96
+    export_rva  = struct.unpack_from('<I', pe_data, 24 + 96)[0]
+    export_size = struct.unpack_from('<I', pe_data, 24 + 100)[0]
 
-    if export_rva == 0:
+    if export_rva == 0 or export_size < 40:
         return None  # Module has no exports
 
-    # --- Step 3: Read the export directory (40 bytes) ---
-    export_dir = (ctypes.c_byte * 40)()
-    if not kernel32.ReadProcessMemory(
-        h_process, module_base + export_rva, export_dir, 40, ctypes.byref(bytes_read)
-    ):
+    # --- Step 3: Read the entire export directory in one call ---
+    # The export data directory extent covers the 40-byte header, the three
+    # arrays and the name strings, so one read replaces the per-array and
+    # per-name ReadProcessMemory calls (O(num_names) syscalls -> 1).
+    # Note: `ed` aliases the shared scratch bytearray and may be longer
+    # than export_size, so every search below is bounded by export_size
+    ed = _read_remote(h_process, module_base + export_rva, export_size)
+    if ed is None:
         return None
 
-    ed = bytes(export_dir)
     num_functions = struct.unpack_from('<I', ed, 20)[0]  # Total exported functions
     num_names     = struct.unpack_from('<I', ed, 24)[0]  # Number of named exports
     func_rvas_rva = struct.unpack_from('<I', ed, 28)[0]  # RVA of function address array
     name_rvas_rva = struct.unpack_from('<I', ed, 32)[0]  # RVA of name pointer array
     ordinals_rva  = struct.unpack_from('<I', ed, 36)[0]  # RVA of ordinal array
 
-    # --- Step 4: Read the three export arrays ---
-    # Name RVA array (each entry is a 4-byte pointer to a function name string)
-    name_rvas_buf = (ctypes.c_byte * (num_names * 4))()
-    kernel32.ReadProcessMemory(
-        h_process, module_base + name_rvas_rva,
-        name_rvas_buf, num_names * 4, ctypes.byref(bytes_read)
-    )
-
-    # Ordinal array (each entry is a 2-byte index into the function address array)
-    ordinals_buf = (ctypes.c_byte * (num_names * 2))()
-    kernel32.ReadProcessMemory(
-        h_process, module_base + ordinals_rva,
-        ordinals_buf, num_names * 2, ctypes.byref(bytes_read)
-    )
-
-    # Function RVA array (each entry is a 4-byte RVA of the function body)
-    func_rvas_buf = (ctypes.c_byte * (num_functions * 4))()
-    kernel32.ReadProcessMemory(
-        h_process, module_base + func_rvas_rva,
-        func_rvas_buf, num_functions * 4, ctypes.byref(bytes_read)
-    )
-
-    name_rvas_data = bytes(name_rvas_buf)
-    ordinals_data  = bytes(ordinals_buf)
-    func_rvas_data = bytes(func_rvas_buf)
-
-    # --- Step 5: Search for the target function by name ---
-    for i in range(num_names):
-        # Get the RVA that points to this export's name string
-        name_rva = struct.unpack_from('<I', name_rvas_data, i * 4)[0]
-
-        # Read the name string from the remote process
-        name_buf = (ctypes.c_byte * 128)()
-        kernel32.ReadProcessMemory(
-            h_process, module_base + name_rva,
-            name_buf, 128, ctypes.byref(bytes_read)
-        )
-        name = bytes(name_buf).split(b'\x00')[0]
+    # Convert the array RVAs into offsets within the single buffer, checking
+    # that each array actually lies inside the export directory extent
+    name_rvas_off = name_rvas_rva - export_rva
+    ordinals_off  = ordinals_rva - export_rva
+    func_rvas_off = func_rvas_rva - export_rva
+    if (not 0 <= name_rvas_off <= export_size - num_names * 4 or
+        not 0 <= ordinals_off  <= export_size - num_names * 2 or
+        not 0 <= func_rvas_off <= export_size - num_functions * 4):
+        return None
 
-        if name == func_name_bytes:
-            # Found it! Use the ordinal to index the function address array
-            ordinal  = struct.unpack_from('<H', ordinals_data, i * 2)[0]
-            func_rva = struct.unpack_from('<I', func_rvas_data, ordinal * 4)[0]
-            return module_base + func_rva  # Convert RVA to virtual address
+    # --- Step 4: Locate the target name at C speed ---
+    # Unpack the whole name-RVA array in one call instead of one
+    # unpack_from per iteration
+    name_rvas = struct.unpack_from('<%dI' % num_names, ed, name_rvas_off)
+
+    # Name strings are null-separated, so searching the raw buffer for
+    # "\0<name>\0" finds the string without a Python-level loop; the RVA
+    # lookup via tuple.index is likewise a single C-level scan
+    i = None
+    pos = ed.find(b'\x00' + func_name_bytes + b'\x00', 0, export_size)
+    if pos >= 0:
+        try:
+            i = name_rvas.index(export_rva + pos + 1)
+        except ValueError:
+            i = None
+
+    if i is None:
+        # Fallback: plain scan (first name in the table has no preceding
+        # null byte, so the fast path can miss it)
+        for j, name_rva in enumerate(name_rvas):
+            name_off = name_rva - export_rva
+            if not 0 <= name_off <= export_size - len(func_name_bytes) - 1:
+                continue
+            if ed[name_off:name_off + len(func_name_bytes) + 1] == func_name_bytes + b'\x00':
+                i = j
+                break
+        else:
+            return None  # Function not found
 
-    return None  # Function not found
+    # --- Step 5: Use the ordinal to index the function address array ---
+    ordinal  = struct.unpack_from('<H', ed, ordinals_off + i * 2)[0]
+    func_rva = struct.unpack_from('<I', ed, func_rvas_off + ordinal * 4)[0]
+    return module_base + func_rva  # Convert RVA to virtual address
 
 # ============================================================
 # Core Injection Logic
@@ -333,19 +684,18 @@ def inject_dll(process_id, dll_path):
 
     Args:
         process_id: PID of the target process
-        dll_path:   Absolute path to the DLL file to inject
+        dll_path:   Absolute path to an existing DLL file to inject
+                    (caller must have resolved and validated it)
 
     Returns:
         True if injection succeeded, False otherwise.
     """
-    # Validate the DLL file exists
-    if not os.path.exists(dll_path):
-        print(f"[ERROR] DLL not found: {dll_path}")
-        return False
-
-    dll_path = os.path.abspath(dll_path)
-    dll_bytes = dll_path.encode('utf-8') + b'\x00'  # Null-terminated string
-    dll_size = len(dll_bytes)
+    # LoadLibraryA takes an ANSI-codepage string, so encode with 'mbcs'
+    # (UTF-8 would corrupt non-ASCII paths). create_string_buffer adds the
+    # null terminator and gives ctypes a stable buffer to pass directly,
+    # avoiding the transient copy a bytes argument incurs.
+    dll_buf = ctypes.create_string_buffer(dll_path.encode('mbcs'))
+    dll_size = ctypes.sizeof(dll_buf)
 
     # --- Open the target process ---
     print(f"[*] Opening process (PID: {process_id})...")
@@ -379,7 +729,7 @@ def inject_dll(process_id, dll_path):
         # --- Write the DLL path string into the allocated memory ---
         bytes_written = ctypes.c_size_t(0)
         if not kernel32.WriteProcessMemory(
-            h_process, remote_memory, dll_bytes, dll_size,
+            h_process, remote_memory, dll_buf, dll_size,
             ctypes.byref(bytes_written)
         ):
             print(f"[ERROR] Write failed. Error: {ctypes.get_last_error()}")
@@ -390,22 +740,30 @@ def inject_dll(process_id, dll_path):
         if cross_arch:
             # For cross-arch: find kernel32.dll in the 32-bit target and
             # parse its PE export table to get the 32-bit LoadLibraryA address
-            kernel32_base = find_remote_module_base(process_id, "kernel32.dll")
-            if kernel32_base is None:
+            remote_kernel32 = find_remote_module(h_process, process_id, "kernel32.dll")
+            if remote_kernel32 is None:
                 print("[ERROR] Could not find kernel32.dll in target process")
                 return False
-
-            load_library_addr = find_remote_export(h_process, kernel32_base, "LoadLibraryA")
-            if load_library_addr is None:
-                print("[ERROR] Could not find LoadLibraryA in target's kernel32.dll")
-                return False
+            kernel32_base, kernel32_size, kernel32_path = remote_kernel32
+
+            # The same kernel32 image exports LoadLibraryA at the same RVA in
+            # every process, so the PE parse only needs to happen once per image
+            cache_key = (target_32bit, kernel32_size, kernel32_path)
+            cached_rva = _loadlib_cache.get(cache_key)
+            if cached_rva is not None:
+                load_library_addr = kernel32_base + cached_rva
+            else:
+                load_library_addr = _find_remote_export_pe32(h_process, kernel32_base, "LoadLibraryA")
+                if load_library_addr is None:
+                    print("[ERROR] Could not find LoadLibraryA in target's kernel32.dll")
+                    return False
+                _loadlib_cache[cache_key] = load_library_addr - kernel32_base
         else:
             # Same architecture: local kernel32 address matches the target's
-            load_library_addr = kernel32.GetProcAddress(
-                kernel32.GetModuleHandleW("kernel32.dll"), b"LoadLibraryA"
-            )
+            # (resolved once at import time)
+            load_library_addr = _LOCAL_LOADLIB
             if not load_library_addr:
-                print(f"[ERROR] GetProcAddress failed. Error: {ctypes.get_last_error()}")
+                print("[ERROR] LoadLibraryA could not be resolved in this process")
                 return False
 
         print(f"[*] LoadLibraryA at 0x{load_library_addr:X}")
@@ -428,8 +786,20 @@ def inject_dll(process_id, dll_path):
         print(f"[*] Remote thread created (handle: {h_thread})")
 
         # --- Wait for the DLL to finish loading ---
+        # Poll in 250ms slices (up to 10s total) instead of one long blocking
+        # wait: LoadLibrary typically returns within tens of ms, and the
+        # exit-code check catches early completion between wait slices
         print("[*] Waiting for DLL to load...")
-        wait_result = kernel32.WaitForSingleObject(h_thread, 10000)  # 10s timeout
+        wait_result = WAIT_TIMEOUT
+        for _ in range(40):
+            wait_result = kernel32.WaitForSingleObject(h_thread, 250)
+            if wait_result != WAIT_TIMEOUT:
+                break
+            exit_code = wintypes.DWORD(0)
+            if (kernel32.GetExitCodeThread(h_thread, ctypes.byref(exit_code))
+                    and exit_code.value != STILL_ACTIVE):
+                wait_result = WAIT_OBJECT_0
+                break
         if wait_result == WAIT_OBJECT_0:
             # Thread finished - check if LoadLibrary returned a valid handle
             exit_code = wintypes.DWORD(0)
@@ -449,6 +819,29 @@ def inject_dll(process_id, dll_path):
         # Always close the process handle
         kernel32.CloseHandle(h_process)
 
+def inject(process_name, dll_path):
+    """Fused find + open + resolve entry point.
+
+    Runs the whole sequence - process lookup, open, architecture
+    detection, LoadLibraryA resolution, remote thread - from one call so
+    callers don't stitch the helpers together themselves.
+
+    Args:
+        process_name: Executable name of the target (e.g. "hl.exe")
+        dll_path:     Absolute path to an existing DLL file to inject
+
+    Returns:
+        True if injection succeeded, False otherwise.
+    """
+    print(f"[*] Searching for {process_name}...")
+    process_id = find_process_by_name(process_name)
+    if process_id is None:
+        print(f"[ERROR] '{process_name}' not found! Make sure it is running.")
+        return False
+    print(f"[*] Found {process_name} (PID: {process_id})\n")
+
+    return inject_dll(process_id, dll_path)
+
 # ============================================================
 # Entry Point
 # ============================================================
@@ -466,6 +859,9 @@ def main():
             script_dir, "target", "i686-pc-windows-msvc",
             "release", "goldsrc_diag_overlay.dll"
         )
+    # Resolve and validate once here; inject_dll expects an absolute,
+    # existing path
+    dll_path = os.path.abspath(dll_path)
 
     # Print banner
     print("=" * 60)
@@ -485,16 +881,8 @@ def main():
         print("  cargo build --release --target i686-pc-windows-msvc")
         sys.exit(1)
 
-    # Find the target process
-    print(f"[*] Searching for {TARGET_PROCESS}...")
-    process_id = find_process_by_name(TARGET_PROCESS)
-    if process_id is None:
-        print(f"[ERROR] '{TARGET_PROCESS}' not found! Make sure it is running.")
-        sys.exit(1)
-    print(f"[*] Found {TARGET_PROCESS} (PID: {process_id})\n")
-
-    # Inject the DLL
-    if inject_dll(process_id, dll_path):
+    # Find the target process and inject the DLL
+    if inject(TARGET_PROCESS, dll_path):
         print(f"\n[*] Injection successful!")
     else:
         print(f"\n[!] Injection failed!")